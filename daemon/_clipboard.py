@@ -0,0 +1,106 @@
+"""
+Clipboard backends for the TexTeller LaTeX Predictor Daemon on Linux.
+On X11 the daemon owns the CLIPBOARD selection in-process instead of spawning
+xclip/xsel for every prediction.
+"""
+
+import os
+import threading
+import subprocess
+
+try:
+    from Xlib import X, Xatom
+    from Xlib.display import Display
+    from Xlib.protocol import event as xevent
+except ImportError:
+    Display = None
+
+
+class X11Clipboard:
+    """Own the X11 CLIPBOARD selection and serve the cached text to other clients."""
+
+    def __init__(self):
+        self._display = Display()
+        screen = self._display.screen()
+        # Unmapped window that only exists to own the selection
+        self._window = screen.root.create_window(0, 0, 1, 1, 0, screen.root_depth)
+        self._clipboard = self._display.intern_atom("CLIPBOARD")
+        self._targets = self._display.intern_atom("TARGETS")
+        self._utf8_string = self._display.intern_atom("UTF8_STRING")
+        self._data = b""
+        self._lock = threading.Lock()
+        threading.Thread(target=self._serve, name="x11-clipboard", daemon=True).start()
+
+    def copy(self, text):
+        """Take ownership of CLIPBOARD with the given text."""
+        with self._lock:
+            self._data = text.encode("utf-8")
+        self._window.set_selection_owner(self._clipboard, X.CurrentTime)
+        if self._display.get_selection_owner(self._clipboard) != self._window:
+            raise RuntimeError("Could not acquire the X11 CLIPBOARD selection")
+
+    def _serve(self):
+        while True:
+            event = self._display.next_event()
+            # SelectionClear needs no handling: another client simply owns the clipboard now
+            if event.type == X.SelectionRequest:
+                self._answer(event)
+
+    def _answer(self, request):
+        # Obsolete clients may not name a property; use the target atom then (ICCCM 2.2)
+        prop = request.property if request.property != X.NONE else request.target
+        if request.target == self._targets:
+            request.requestor.change_property(
+                prop, Xatom.ATOM, 32, [self._targets, self._utf8_string, Xatom.STRING]
+            )
+        elif request.target in (self._utf8_string, Xatom.STRING):
+            with self._lock:
+                data = self._data
+            request.requestor.change_property(prop, request.target, 8, data)
+        else:
+            prop = X.NONE
+
+        notify = xevent.SelectionNotify(
+            time=request.time,
+            requestor=request.requestor,
+            selection=request.selection,
+            target=request.target,
+            property=prop,
+        )
+        request.requestor.send_event(notify)
+        self._display.flush()
+
+
+class LinuxClipboard:
+    """Copy text on Linux, owning the X11 selection when possible and spawning tools otherwise."""
+
+    def __init__(self):
+        self._x11 = None
+        self._wayland = bool(os.environ.get("WAYLAND_DISPLAY"))
+        if not self._wayland and os.environ.get("DISPLAY") and Display is not None:
+            try:
+                self._x11 = X11Clipboard()
+            except Exception as e:
+                print(f"Warning: X11 clipboard unavailable ({e}), falling back to xclip/xsel")
+
+    def copy(self, text):
+        """Copy text to the clipboard."""
+        if self._x11 is not None:
+            self._x11.copy(text)
+            return
+
+        if self._wayland:
+            try:
+                subprocess.run(['wl-copy'], input=text, text=True, check=True)
+                return
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                pass
+
+        # Try xclip first, then xsel
+        try:
+            subprocess.run(['xclip', '-selection', 'clipboard'], input=text, text=True, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            try:
+                subprocess.run(['xsel', '--clipboard', '--input'], input=text, text=True, check=True)
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                print("Warning: Could not copy to clipboard. Install python-xlib, wl-clipboard, xclip or xsel.")
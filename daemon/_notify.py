@@ -0,0 +1,64 @@
+"""
+Desktop notifications for the TexTeller LaTeX Predictor Daemon.
+Notifications go through one D-Bus session bus connection held for the daemon's
+lifetime instead of spawning notify-send for every event.
+"""
+
+import threading
+import subprocess
+
+try:
+    import dbus
+except ImportError:
+    dbus = None
+
+
+# Map notification types to freedesktop urgency levels (0 low, 1 normal, 2 critical)
+URGENCY_LEVELS = {
+    "info": 1,
+    "success": 1,
+    "error": 2,
+    "warning": 1
+}
+URGENCY_NAMES = {0: "low", 1: "normal", 2: "critical"}
+
+
+class DesktopNotifier:
+    """Send notifications over org.freedesktop.Notifications, falling back to notify-send."""
+
+    def __init__(self, app_name="TexTeller"):
+        self.app_name = app_name
+        self._iface = None
+        self._lock = threading.Lock()
+        if dbus is not None:
+            try:
+                bus = dbus.SessionBus()
+                notifier = bus.get_object("org.freedesktop.Notifications", "/org/freedesktop/Notifications")
+                self._iface = dbus.Interface(notifier, "org.freedesktop.Notifications")
+            except Exception as e:
+                print(f"Warning: D-Bus notifications unavailable ({e}), falling back to notify-send")
+
+    def notify(self, title, message, notification_type="info"):
+        """Show a desktop notification."""
+        urgency = URGENCY_LEVELS.get(notification_type, 1)
+
+        if self._iface is not None:
+            try:
+                with self._lock:
+                    self._iface.Notify(
+                        self.app_name, dbus.UInt32(0), "", title, message, [],
+                        {"urgency": dbus.Byte(urgency)}, -1
+                    )
+                return
+            except dbus.exceptions.DBusException as e:
+                # The notification server may have restarted; notify-send opens a fresh connection
+                print(f"Warning: D-Bus notification failed ({e}), falling back to notify-send")
+
+        # Send notification using notify-send
+        subprocess.run([
+            'notify-send',
+            f'--urgency={URGENCY_NAMES[urgency]}',
+            f'--app-name={self.app_name}',
+            title,
+            message
+        ], check=True)
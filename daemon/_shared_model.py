@@ -0,0 +1,56 @@
+"""
+Model loading shared by the TexTeller daemons.
+The PyTorch weights are exported once to a file under the TexTeller cache directory
+and memory-mapped by every daemon process, so all daemon variants running at once
+read the same page-cache pages instead of each holding a private copy.
+"""
+
+import torch
+from transformers import GenerationConfig, VisionEncoderDecoderConfig, VisionEncoderDecoderModel
+from transformers.modeling_utils import no_init_weights
+
+from texteller.api import load_model
+from texteller.globals import Globals
+from texteller.utils.path import atomic_dir
+
+WEIGHTS_FILE = "weights.pt"
+
+
+def get_shared_model_dir():
+    """Get the directory holding the exported config and weights."""
+    return Globals().cache_dir / "shared_model"
+
+
+def _export_model(model, model_dir):
+    """Write the model's config and weights to model_dir, atomically."""
+    # If another daemon exports the model first, its copy is used
+    with atomic_dir(model_dir) as tmp_dir:
+        model.config.save_pretrained(tmp_dir)
+        model.generation_config.save_pretrained(tmp_dir)
+        torch.save(model.state_dict(), tmp_dir / WEIGHTS_FILE)
+
+
+def get_shared_model(use_onnx=False):
+    """
+    Load the TexTeller model with its weights memory-mapped from the shared export.
+
+    The first call exports the default model; later calls, from any process, build an
+    uninitialized model and assign the mapped tensors to it without copying them.
+    ONNX Runtime sessions own their weights, so use_onnx=True loads the model as usual.
+    """
+    if use_onnx:
+        return load_model(use_onnx=True)
+
+    model_dir = get_shared_model_dir()
+    if not (model_dir / WEIGHTS_FILE).exists():
+        _export_model(load_model(use_onnx=False), model_dir)
+
+    config = VisionEncoderDecoderConfig.from_pretrained(model_dir)
+    # Skip random initialization: every parameter is replaced by a mapped tensor below
+    with no_init_weights():
+        model = VisionEncoderDecoderModel(config=config)
+    state_dict = torch.load(model_dir / WEIGHTS_FILE, map_location="cpu", mmap=True, weights_only=True)
+    model.load_state_dict(state_dict, assign=True)
+    model.tie_weights()
+    model.generation_config = GenerationConfig.from_pretrained(model_dir)
+    return model.eval()
@@ -7,6 +7,7 @@ This script removes the virtual environment and cleans up temporary files.
 import os
 import sys
 import shutil
+import subprocess
 from pathlib import Path
 
 
@@ -17,6 +18,27 @@ def cleanup_venv():
     
     if venv_path.exists():
         print(f"Removing virtual environment: {venv_path}")
+        if sys.platform != "win32":
+            try:
+                # Move the venv out of the way atomically, then delete its tens of
+                # thousands of files in a detached process instead of blocking here
+                trash_path = venv_path.with_name(f".{venv_path.name}.trash-{os.getpid()}")
+                os.rename(venv_path, trash_path)
+                proc = subprocess.Popen(
+                    ["rm", "-rf", str(trash_path)],
+                    start_new_session=True,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                print("✅ Virtual environment removed")
+                print(f"Unlinking in background (pid={proc.pid})")
+                return
+            except OSError as e:
+                print(f"Warning: Background removal failed ({e}), removing in place")
+                # The rename may have succeeded before rm failed to start
+                if not venv_path.exists() and trash_path.exists():
+                    venv_path = trash_path
         shutil.rmtree(venv_path)
         print("✅ Virtual environment removed")
     else:
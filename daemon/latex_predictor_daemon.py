@@ -7,27 +7,172 @@ When /tmp/latexPredict.png changes, it makes a prediction and copies the result
 import os
 import sys
 import time
+import mmap
+import signal
+import queue
+import ctypes
+import select
+import struct
+import threading
 import subprocess
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from texteller.api import load_model, load_tokenizer, img2latex
-from texteller.utils import get_device
+from texteller.api import load_tokenizer, img2latex
+from texteller.utils import get_device, readimgs
 from texteller.models import TexTeller
 from texteller.globals import Globals
 
+from _clipboard import LinuxClipboard
+from _shared_model import get_shared_model
+from _notify import DesktopNotifier
+from model_state_plane import StatePlaneClient
+
+# libvips decodes PNGs faster than OpenCV; readimgs is used without it
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+# inotify(7) flags, see <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Quiet period after the last file event before the target is processed
+DEBOUNCE_SECONDS = 0.1
+
+# Snapshots arriving within this window of the first queued one replace it
+COALESCE_WINDOW_SECONDS = 0.05
+
+
+class _InotifyWatcher:
+    """Watch the target file through a raw inotify descriptor instead of watchdog.
+
+    The kernel only reports IN_CLOSE_WRITE/IN_MOVED_TO for the watched directory, and
+    the watcher thread sleeps in poll() until one arrives, so unrelated churn in /tmp
+    costs a name comparison rather than a full watchdog event dispatch. Exposes the
+    same start/stop/join interface as watchdog's Observer.
+    """
+
+    def __init__(self, handler, target_file_path):
+        self.handler = handler
+        self.target_file_path = os.path.abspath(str(target_file_path))
+        directory, name = os.path.split(self.target_file_path)
+        self._name = os.fsencode(name)
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, f"inotify_add_watch failed on {directory}: {os.strerror(err)}")
+
+        # Self-pipe used to wake the watcher thread on stop()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="inotify-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        os.write(self._wake_w, b"\0")
+
+    def join(self):
+        self._thread.join()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def _run(self):
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        poller.register(self._wake_r, select.POLLIN)
+        while True:
+            ready = [fd for fd, _ in poller.poll()]
+            if self._wake_r in ready:
+                return
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            # Only one callback per read, however many times the target appears in it
+            if self._name in self._event_names(buf):
+                self.handler.handle_target_change(self.target_file_path)
+
+    @staticmethod
+    def _event_names(buf):
+        offset = 0
+        while offset < len(buf):
+            _, _, _, name_len = _INOTIFY_EVENT.unpack_from(buf, offset)
+            offset += _INOTIFY_EVENT.size
+            yield buf[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+
+def decode_image(image_data):
+    """Decode encoded image contents (bytes or a mapped file) to an RGB uint8 array."""
+    if pyvips is None:
+        return readimgs([image_data])[0]
+
+    # A memory source wraps any buffer (including an mmap) without copying it
+    source = pyvips.Source.new_from_memory(image_data)
+    image = pyvips.Image.new_from_source(source, "", access="sequential")
+    if image.format == "ushort":
+        image = image.cast("uchar", shift=True)
+    elif image.format != "uchar":
+        image = image.cast("uchar")
+    if image.hasalpha():
+        image = image.extract_band(0, n=image.bands - 1)
+    if image.bands == 1:
+        image = image.bandjoin([image, image])
+    return image.numpy()
+
+
+def create_observer(handler, target_file_path):
+    """Create a file observer for the target, preferring inotify on Linux."""
+    if sys.platform == "linux":
+        try:
+            return _InotifyWatcher(handler, target_file_path)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), falling back to watchdog")
+
+    observer = Observer()
+    # Monitor the directory containing the target file
+    observer.schedule(handler, os.path.dirname(os.path.abspath(str(target_file_path))), recursive=False)
+    return observer
+
 
 class LatexPredictorHandler(FileSystemEventHandler):
     """File system event handler for monitoring latexPredict.png changes."""
     
-    def __init__(self, model, tokenizer, device, target_file_path):
+    def __init__(self, model, tokenizer, device, target_file_path, state_client=None):
         self.model = model
         self.tokenizer = tokenizer
         self.device = device
+        # When attached to a resident state plane, predictions are delegated to it
+        self.state_client = state_client
         # Normalize to absolute path for reliable event matching
         self.target_file_path = os.path.abspath(str(target_file_path))
-        self.last_modified = 0
+        # Spellings of the target an observer may report (e.g. /tmp behind a symlink)
+        self._targets = frozenset([self.target_file_path, os.path.realpath(self.target_file_path)])
+        # (inode, mtime) of the last processed version of the target file
+        self.last_modified = None
+        self._pending_timer = None
+        self._timer_lock = threading.Lock()
+        # Snapshots of the target waiting to be predicted by the prediction worker
+        self._queue = queue.Queue()
+        threading.Thread(target=self._predict_loop, name="prediction-worker", daemon=True).start()
+        # Opened once so copies do not fork a clipboard tool each time
+        self._clip = LinuxClipboard() if sys.platform == "linux" else None
+        # One D-Bus connection for all notifications instead of a notify-send per event
+        self._notifier = DesktopNotifier()
         
     def on_modified(self, event):
         """Handle file modification events."""
@@ -43,44 +188,77 @@ class LatexPredictorHandler(FileSystemEventHandler):
     
     def _handle_file_event(self, event, event_type):
         """Handle any file event that might affect our target file."""
-        if event.is_directory:
-            return
-        
         # Some apps (e.g., gnome-screenshot) write a temp file and then move it
         # into place. For move events we need to check the destination path.
-        src_path = os.path.abspath(getattr(event, "src_path", ""))
-        dest_path = os.path.abspath(getattr(event, "dest_path", src_path))
+        path = getattr(event, "dest_path", "") or event.src_path
 
-        # Determine the relevant path for this event
-        candidate_path = dest_path if dest_path else src_path
+        # Compare the raw event path first: the watched directory is usually a
+        # busy /tmp and nearly every event is for some other file
+        if path not in self._targets or event.is_directory:
+            return
+        self.handle_target_change(self.target_file_path)
 
-        # Only process if it's exactly our target file
-        if candidate_path == self.target_file_path:
-            # Debounce using mtime to avoid duplicate processing bursts
+    def handle_target_change(self, image_path):
+        """Handle a change to the target file reported by any observer."""
+        # Trailing-edge debounce: every event restarts the timer, so a burst of
+        # writes and renames is processed once after it settles
+        with self._timer_lock:
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(DEBOUNCE_SECONDS, self._fire, args=(image_path,))
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def _fire(self, image_path):
+        """Process the target file once its burst of events has settled."""
+        # Hold one descriptor for stat and read, so a concurrent rename cannot
+        # swap the file between the two
+        try:
+            fd = os.open(image_path, os.O_RDONLY | os.O_NONBLOCK)
+        except FileNotFoundError:
+            # In rare cases, rapid replace can briefly make the file missing; the
+            # event that puts it back schedules another run
+            return
+        with os.fdopen(fd, "rb") as f:
+            stat = os.fstat(f.fileno())
+            # Skip events that did not change the file (e.g. closing it unmodified)
+            version = (stat.st_ino, stat.st_mtime_ns)
+            if version == self.last_modified:
+                return
+            self.last_modified = version
             try:
-                current_time = os.path.getmtime(candidate_path)
-            except FileNotFoundError:
-                # In rare cases, rapid replace can briefly make the file missing; skip
+                # Decode straight from the page cache instead of copying the file
+                # into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image_data:
+                    image = decode_image(image_data)
+            except Exception as e:
+                print(f"Error reading image: {e}")
+                self.send_notification("TexTeller", f"Error reading image: {str(e)}", "error")
                 return
-            if current_time > self.last_modified + 1:  # 1 second debounce
-                self.last_modified = current_time
-                self.process_image(candidate_path)
+        self._queue.put((image_path, image))
+    
+    def _predict_loop(self):
+        """Predict the newest queued snapshot, skipping the ones it superseded."""
+        while True:
+            snapshot = self._queue.get()
+            # There is only one target file, so older snapshots are versions the user
+            # has already overwritten: predicting them would only delay the newest one
+            deadline = time.monotonic() + COALESCE_WINDOW_SECONDS
+            while True:
+                timeout = deadline - time.monotonic()
+                try:
+                    snapshot = self._queue.get(timeout=max(timeout, 0))
+                except queue.Empty:
+                    break
+            self.process_image(*snapshot)
     
-    def process_image(self, image_path):
-        """Process the image and copy result to clipboard."""
+    def process_image(self, image_path, image):
+        """Process a decoded snapshot of the target and copy the result to clipboard."""
         try:
             print(f"Processing image: {image_path}")
             
             # Make prediction
-            prediction = img2latex(
-                model=self.model,
-                tokenizer=self.tokenizer,
-                images=[image_path],
-                device=self.device,
-                out_format="katex",
-                keep_style=False,
-                num_beams=1
-            )[0]
+            prediction = self.predict([image])[0]
             
             print(f"Predicted LaTeX: {prediction}")
             
@@ -96,28 +274,42 @@ class LatexPredictorHandler(FileSystemEventHandler):
             # Send error notification
             self.send_notification("TexTeller", f"Error processing image: {str(e)}", "error")
     
+    def predict(self, images):
+        """Run the model on a list of images, remotely if a state plane is attached."""
+        if self.state_client is not None:
+            try:
+                return self.state_client.predict(images)
+            except (OSError, EOFError) as e:
+                # The state plane went away: reattach to a restarted one, or load the
+                # model here so the daemon keeps working until it comes back
+                print(f"Warning: Lost connection to state plane ({e})")
+                self.state_client.close()
+                self.state_client = StatePlaneClient.connect()
+                if self.state_client is not None:
+                    return self.state_client.predict(images)
+                self._load_local_model()
+        return img2latex(
+            model=self.model,
+            tokenizer=self.tokenizer,
+            images=images,
+            device=self.device,
+            out_format="katex",
+            keep_style=False,
+            num_beams=1
+        )
+    
+    def _load_local_model(self):
+        """Load the model in this process, for when no state plane is reachable."""
+        print("Loading TexTeller model (PyTorch backend)...")
+        self.model = get_shared_model(use_onnx=False)
+        self.tokenizer = load_tokenizer()
+        self.device = get_device()
+        print(f"Model loaded successfully on device: {self.device}")
+    
     def send_notification(self, title, message, notification_type="info"):
-        """Send desktop notification using notify-send."""
+        """Send desktop notification over D-Bus (notify-send as fallback)."""
         try:
-            # Map notification types to notify-send urgency levels
-            urgency_map = {
-                "info": "normal",
-                "success": "normal", 
-                "error": "critical",
-                "warning": "normal"
-            }
-            
-            urgency = urgency_map.get(notification_type, "normal")
-            
-            # Send notification using notify-send
-            subprocess.run([
-                'notify-send', 
-                f'--urgency={urgency}',
-                '--app-name=TexTeller',
-                title, 
-                message
-            ], check=True)
-            
+            self._notifier.notify(title, message, notification_type)
         except (subprocess.CalledProcessError, FileNotFoundError):
             print(f"Warning: Could not send notification. Make sure notify-send is installed.")
         except Exception as e:
@@ -128,14 +320,7 @@ class LatexPredictorHandler(FileSystemEventHandler):
         try:
             # Try different clipboard methods based on the system
             if sys.platform == "linux":
-                # For Linux, try xclip first, then xsel
-                try:
-                    subprocess.run(['xclip', '-selection', 'clipboard'], input=text, text=True, check=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    try:
-                        subprocess.run(['xsel', '--clipboard', '--input'], input=text, text=True, check=True)
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        print("Warning: Could not copy to clipboard. Install xclip or xsel.")
+                self._clip.copy(text)
             elif sys.platform == "darwin":  # macOS
                 subprocess.run(['pbcopy'], input=text, text=True, check=True)
             elif sys.platform == "win32":  # Windows
@@ -148,51 +333,48 @@ class LatexPredictorHandler(FileSystemEventHandler):
 
 def main():
     """Main function to run the latex predictor daemon."""
-    print("Loading TexTeller model (PyTorch backend)...")
+    # Reuse the model held by a running state plane if there is one
+    state_client = StatePlaneClient.connect()
     
     # Load model and tokenizer once at startup
     try:
-        # Use standard PyTorch model for correctness (optimize later if needed)
-        model = load_model(use_onnx=False)
-        tokenizer = load_tokenizer()
-        device = get_device()
-        print(f"Model loaded successfully on device: {device}")
-        
-        # Send startup notification
-        try:
-            subprocess.run([
-                'notify-send', 
-                '--urgency=normal',
-                '--app-name=TexTeller',
-                'TexTeller Daemon', 
-                f'Model loaded on {device}. Monitoring /tmp/latexPredict.png'
-            ], check=True)
-        except:
-            pass  # Don't fail if notification doesn't work
+        if state_client is not None:
+            model, tokenizer, device = None, None, state_client.device
+            print(f"Using resident model from state plane {state_client.address} on device: {device}")
+        else:
+            print("Loading TexTeller model (PyTorch backend)...")
+            # Use standard PyTorch model for correctness (optimize later if needed)
+            model = get_shared_model(use_onnx=False)
+            tokenizer = load_tokenizer()
+            device = get_device()
+            print(f"Model loaded successfully on device: {device}")
     except Exception as e:
         print(f"Error loading model: {e}")
         return 1
     
     # Set up file monitoring for the specific file
     target_file = Path("/tmp/latexPredict.png")
-    event_handler = LatexPredictorHandler(model, tokenizer, device, target_file)
-    observer = Observer()
-    
-    # Monitor the directory containing the target file
-    observer.schedule(event_handler, "/tmp", recursive=False)
+    event_handler = LatexPredictorHandler(model, tokenizer, device, target_file, state_client)
+    # Send startup notification
+    event_handler.send_notification('TexTeller Daemon', f'Model loaded on {device}. Monitoring /tmp/latexPredict.png')
+    observer = create_observer(event_handler, target_file)
     
     print(f"Monitoring file: {target_file}")
     print("Waiting for changes to latexPredict.png...")
     print("Press Ctrl+C to stop.")
     
-    try:
-        observer.start()
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nStopping daemon...")
-        observer.stop()
+    # Sleep until SIGINT/SIGTERM instead of waking up every second
+    stop_event = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop_event.set())
+    # Windows cannot interrupt a blocking wait with Ctrl+C, so poll there
+    timeout = 1 if sys.platform == "win32" else None
     
+    observer.start()
+    while not stop_event.wait(timeout):
+        pass
+    print("\nStopping daemon...")
+    observer.stop()
     observer.join()
     print("Daemon stopped.")
     return 0
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Resident model server for the TexTeller LaTeX Predictor Daemon.
+Loads the model once and serves predictions over a Unix domain socket, so the
+file-watching frontend can be restarted without paying the model load again.
+"""
+
+import os
+import sys
+import stat
+import secrets
+import tempfile
+import threading
+from pathlib import Path
+from multiprocessing.connection import Client, Listener, AuthenticationError
+
+from texteller.api import load_tokenizer, img2latex
+from texteller.utils import get_device
+
+from _shared_model import get_shared_model
+
+
+def get_state_dir():
+    """Get the per-user directory holding the state plane socket and key."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "texteller"
+    return Path(tempfile.gettempdir()) / f"texteller-{os.getuid()}"
+
+
+def check_private(path, mode):
+    """
+    Raise PermissionError unless path is ours alone.
+
+    Without XDG_RUNTIME_DIR the state directory has a predictable name in the shared
+    temp directory, so another local user could create it first and plant their own
+    key and socket. lstat() is used so a symlink to a private-looking file is refused.
+    """
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        raise PermissionError(f"{path} is a symlink")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {st.st_uid}, not {os.getuid()}")
+    if stat.S_IMODE(st.st_mode) != mode:
+        raise PermissionError(f"{path} has mode {stat.S_IMODE(st.st_mode):o}, expected {mode:o}")
+
+
+def get_socket_paths(state_dir=None):
+    """Get the socket and authentication key paths of the state plane."""
+    state_dir = Path(state_dir) if state_dir is not None else get_state_dir()
+    return state_dir / "state.sock", state_dir / "state.key"
+
+
+class StatePlaneClient:
+    """Client side of the state plane, used by the daemon in place of a local model."""
+
+    def __init__(self, conn, address):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self.address = address
+        # The server greets every connection with the device it runs on
+        self.device = conn.recv()
+
+    @classmethod
+    def connect(cls, state_dir=None):
+        """Connect to a running state plane, or return None if none is reachable."""
+        if sys.platform == "win32":
+            return None
+        socket_path, key_path = get_socket_paths(state_dir)
+        try:
+            # The server unpickles nothing from us, but we unpickle its replies:
+            # only trust a key and socket set up by our own user
+            check_private(socket_path.parent, 0o700)
+            check_private(key_path, 0o600)
+            authkey = key_path.read_bytes()
+            conn = Client(str(socket_path), family="AF_UNIX", authkey=authkey)
+            return cls(conn, socket_path)
+        except PermissionError as e:
+            print(f"Warning: Ignoring untrusted state plane: {e}")
+            return None
+        except (OSError, EOFError, AuthenticationError):
+            return None
+
+    def predict(self, images):
+        """Send images (paths or RGB arrays) to the resident model and return the predictions."""
+        with self._lock:
+            self._conn.send(images)
+            status, payload = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"State plane error: {payload}")
+        return payload
+
+    def close(self):
+        self._conn.close()
+
+
+class StatePlaneServer:
+    """Owns the loaded model and answers prediction requests from daemon frontends."""
+
+    def __init__(self, model, tokenizer, device, state_dir=None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.socket_path, self.key_path = get_socket_paths(state_dir)
+        # One model, many frontends: run inference one request at a time
+        self._model_lock = threading.Lock()
+
+    def serve_forever(self):
+        """Accept frontend connections until interrupted."""
+        state_dir = self.socket_path.parent
+        state_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Only tighten a directory we own; one planted by another user is refused below
+        st = os.lstat(state_dir)
+        if not stat.S_ISLNK(st.st_mode) and st.st_uid == os.getuid():
+            os.chmod(state_dir, 0o700)
+        check_private(state_dir, 0o700)
+
+        authkey = secrets.token_bytes(32)
+        fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+        # O_CREAT's mode is not applied to a key left behind by a previous run
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(authkey)
+
+        # Remove a stale socket left behind by a previous run
+        self.socket_path.unlink(missing_ok=True)
+
+        try:
+            with Listener(str(self.socket_path), family="AF_UNIX", authkey=authkey) as listener:
+                while True:
+                    try:
+                        conn = listener.accept()
+                    except (OSError, EOFError, AuthenticationError) as e:
+                        print(f"Warning: Rejected state plane connection: {e}")
+                        continue
+                    threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self.socket_path.unlink(missing_ok=True)
+            self.key_path.unlink(missing_ok=True)
+
+    def _serve_connection(self, conn):
+        with conn:
+            conn.send(str(self.device))
+            while True:
+                try:
+                    images = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    with self._model_lock:
+                        predictions = img2latex(
+                            model=self.model,
+                            tokenizer=self.tokenizer,
+                            images=images,
+                            device=self.device,
+                            out_format="katex",
+                            keep_style=False,
+                            num_beams=1
+                        )
+                    conn.send(("ok", predictions))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+
+
+def main():
+    """Main function to run the resident model server."""
+    if sys.platform == "win32":
+        print("Error: The state plane requires Unix domain sockets and is not supported on Windows")
+        return 1
+
+    print("Loading TexTeller model for the state plane (PyTorch backend)...")
+    try:
+        model = get_shared_model(use_onnx=False)
+        tokenizer = load_tokenizer()
+        device = get_device()
+        model = model.to(device)
+        print(f"Model loaded successfully on device: {device}")
+    except Exception as e:
+        print(f"Error loading model: {e}")
+        return 1
+
+    server = StatePlaneServer(model, tokenizer, device)
+    print(f"Serving predictions on: {server.socket_path}")
+    print("Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping state plane...")
+    except PermissionError as e:
+        print(f"Error: Refusing to use state directory: {e}")
+        return 1
+
+    print("State plane stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
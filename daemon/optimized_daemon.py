@@ -8,17 +8,34 @@ Monitors /tmp/latexPredict.png for changes.
 import os
 import sys
 import time
+import mmap
+import signal
+import threading
+import errno
+import ctypes
+import sqlite3
+import hashlib
+import contextlib
 import subprocess
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from transformers import GenerationConfig
+from transformers.modeling_outputs import BaseModelOutput
 
-from texteller.api import load_model, load_tokenizer, img2latex
-from texteller.utils import get_device
+from texteller.api import load_tokenizer, img2latex
+from texteller.utils import get_device, readimgs
+from texteller.utils.image import trim_white_border
+from texteller.utils.onnx_convert import convert_onnx_model_dir, quantize_int8
 from texteller.models import TexTeller
 from texteller.globals import Globals
+from texteller.constants import FIXED_IMG_SIZE, IMG_CHANNELS, MAX_TOKEN_SIZE
+import cv2
 import torch
-import numpy as np
+
+from _clipboard import LinuxClipboard
+from _shared_model import get_shared_model
+from _notify import DesktopNotifier
 
 # Import ONNX model type for type checking
 try:
@@ -26,6 +43,194 @@ try:
 except ImportError:
     ORTModelForVision2Seq = None
 
+# BLAKE3 is faster on large screenshots, BLAKE2 from hashlib is always available
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# statx(2) flags, see <fcntl.h> and <linux/stat.h>
+AT_FDCWD = -100
+AT_NO_AUTOMOUNT = 0x800
+AT_STATX_DONT_SYNC = 0x4000
+STATX_MTIME = 0x40
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_int64),
+        ("tv_nsec", ctypes.c_uint32),
+        ("_reserved", ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("_spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", _StatxTimestamp),
+        ("stx_btime", _StatxTimestamp),
+        ("stx_ctime", _StatxTimestamp),
+        ("stx_mtime", _StatxTimestamp),
+        # Fields added by newer kernels; struct statx is 256 bytes in total
+        ("_spare", ctypes.c_uint64 * 16),
+    ]
+
+
+# glibc >= 2.28 exposes statx(); resolve it once at import time
+_libc = ctypes.CDLL(None, use_errno=True) if sys.platform == "linux" else None
+_statx = getattr(_libc, "statx", None)
+
+
+def _statx_mtime(path):
+    """Return the mtime of path with one non-syncing statx(2) call, or None if it is missing."""
+    if _statx is None:
+        try:
+            return os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+    buf = _Statx()
+    if _statx(AT_FDCWD, os.fsencode(path), AT_NO_AUTOMOUNT | AT_STATX_DONT_SYNC, STATX_MTIME, ctypes.byref(buf)) != 0:
+        err = ctypes.get_errno()
+        # Rapid replace can briefly make the file missing
+        if err in (errno.ENOENT, errno.EINTR):
+            return None
+        raise OSError(err, os.strerror(err), path)
+    return buf.stx_mtime.tv_sec + buf.stx_mtime.tv_nsec / 1e9
+
+
+# Dummy inferences run at startup to trigger compilation and autotuning
+WARMUP_ITERATIONS = 3
+
+# Opt-in: downscale large screenshots with OpenCV before img2latex. The model was
+# trained on torchvision's bicubic antialiased resize and the area filter gives
+# slightly different pixels, so this trades exact preprocessing for speed.
+FAST_DOWNSCALE = os.environ.get("TEXTELLER_FAST_DOWNSCALE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+def _content_hash(data):
+    """Hash image bytes for the prediction cache."""
+    if blake3 is not None:
+        return blake3.blake3(data).digest()
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+def _fast_downscale(image):
+    """
+    Trim and downscale an RGB image to the size img2latex would resize it to.
+
+    OpenCV's area filter is much cheaper than resizing a full screenshot as a tensor,
+    and leaves img2latex's Resize step with nothing to do. Images that need upscaling
+    are only trimmed and still get the bicubic path.
+    """
+    image = trim_white_border(image)
+    height, width = image.shape[:2]
+    if height == 0 or width == 0:
+        return image
+    # Same output size as torchvision's Resize(FIXED_IMG_SIZE - 1, max_size=FIXED_IMG_SIZE)
+    short, long = (width, height) if width <= height else (height, width)
+    new_short, new_long = FIXED_IMG_SIZE - 1, int((FIXED_IMG_SIZE - 1) * long / short)
+    if new_long > FIXED_IMG_SIZE:
+        new_short, new_long = int(FIXED_IMG_SIZE * new_short / new_long), FIXED_IMG_SIZE
+    new_height, new_width = (new_long, new_short) if width <= height else (new_short, new_long)
+    if new_height >= height or new_width >= width:
+        return image
+    return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+
+
+def _model_fingerprint(model):
+    """Identify the served model variant and the files it was loaded from."""
+    model = getattr(model, "_orig_mod", model)
+    if ORTModelForVision2Seq is not None and isinstance(model, ORTModelForVision2Seq):
+        source = Path(model.model_save_dir)
+    else:
+        source = Path(model.config._name_or_path)
+    # The opt-in downscale changes the model input, so it is part of the identity too
+    parts = [
+        type(model).__name__,
+        str(getattr(model, "dtype", "")),
+        str(source),
+        f"fast_downscale={FAST_DOWNSCALE}",
+    ]
+    # A re-export or re-conversion rewrites the files, so it gets a new fingerprint
+    if source.is_dir():
+        for path in sorted(p for p in source.rglob("*") if p.is_file()):
+            st = path.stat()
+            parts.append(f"{path.relative_to(source)}:{st.st_size}:{st.st_mtime_ns}")
+    return hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _convert_onnx_model(model, variant, convert, provider):
+    """
+    Apply convert(src_path, dst_path) to every ONNX file of an ORT model.
+
+    The converted model is cached under the TexTeller cache directory, so the
+    conversion only runs on the first start. Returns the converted model directory.
+    """
+    dst_dir = Globals().cache_dir / "onnx" / variant
+    if dst_dir.exists():
+        return dst_dir
+    return convert_onnx_model_dir(model.model_save_dir, dst_dir, convert, provider)
+
+
+class _CUDAGraphEncoder(torch.nn.Module):
+    """
+    Encoder wrapper that replays a captured CUDA graph for single-image batches.
+
+    img2latex always pads images to FIXED_IMG_SIZE, so a batch of one matches the
+    captured input exactly and the whole ViT forward becomes one graph launch.
+    Any other call falls through to the wrapped encoder.
+    """
+    
+    def __init__(self, encoder, static_input):
+        super().__init__()
+        self.encoder = encoder
+        # VisionEncoderDecoderModel reads these from its encoder
+        self.config = encoder.config
+        self.main_input_name = encoder.main_input_name
+        self._static_input = static_input
+        
+        with torch.no_grad():
+            # CUDA graph capture requires warmup iterations on a side stream
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(WARMUP_ITERATIONS):
+                    encoder(pixel_values=static_input)
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            self._graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self._graph):
+                self._static_output = encoder(pixel_values=static_input).last_hidden_state
+    
+    def forward(self, pixel_values=None, **kwargs):
+        if (
+            pixel_values is None
+            or pixel_values.shape != self._static_input.shape
+            or pixel_values.dtype != self._static_input.dtype
+            or torch.is_grad_enabled()
+            or kwargs.get("output_attentions")
+            or kwargs.get("output_hidden_states")
+        ):
+            return self.encoder(pixel_values=pixel_values, **kwargs)
+        
+        self._static_input.copy_(pixel_values)
+        self._graph.replay()
+        # The graph reuses its output buffer on the next replay
+        last_hidden_state = self._static_output.clone()
+        if kwargs.get("return_dict") is False:
+            return (last_hidden_state,)
+        return BaseModelOutput(last_hidden_state=last_hidden_state)
+
 
 class OptimizedLatexPredictorHandler(FileSystemEventHandler):
     """Optimized file system event handler with performance improvements."""
@@ -36,12 +241,66 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
         self.device = device
         self.target_file_path = str(target_file_path)
         self.last_modified = 0
+        # Opened once so copies do not fork a clipboard tool each time
+        self._clip = LinuxClipboard() if sys.platform == "linux" else None
+        # One D-Bus connection for all notifications instead of a notify-send per event
+        self._notifier = DesktopNotifier()
         
         # Performance optimizations
         self._setup_optimizations()
         
+        # Predictions keyed by model and image content, so re-saving the same PNG skips
+        # inference. Set up after the optimizations, which may swap the model variant.
+        self._model_id = _model_fingerprint(self.model)
+        self._cache = self._open_cache()
+    
+    def _open_cache(self):
+        """Open the on-disk prediction cache, or return None if it is unavailable."""
+        cache_path = Globals().cache_dir / "pred.sqlite"
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Events are handled on the observer thread, not the one creating the handler
+            cache = sqlite3.connect(cache_path, isolation_level=None, check_same_thread=False)
+            cache.execute(
+                "CREATE TABLE IF NOT EXISTS pred_by_model"
+                "(model TEXT, h BLOB, latex TEXT, PRIMARY KEY(model, h)) WITHOUT ROWID"
+            )
+            return cache
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Prediction cache disabled: {e}")
+            return None
+    
+    def close(self):
+        """Close the prediction cache once no more events will be handled."""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+    
+    def _cache_get(self, image_hash):
+        if self._cache is None:
+            return None
+        row = self._cache.execute(
+            "SELECT latex FROM pred_by_model WHERE model=? AND h=?", (self._model_id, image_hash)
+        ).fetchone()
+        return row[0] if row is not None else None
+    
+    def _cache_put(self, image_hash, prediction):
+        if self._cache is None:
+            return
+        try:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO pred_by_model(model, h, latex) VALUES (?, ?, ?)",
+                (self._model_id, image_hash, prediction),
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not cache prediction: {e}")
+        
     def _setup_optimizations(self):
         """Set up various performance optimizations."""
+        # Swap ONNX weights for reduced precision ones
+        if ORTModelForVision2Seq is not None and isinstance(self.model, ORTModelForVision2Seq):
+            self._setup_onnx_runtime()
+        
         # Enable optimizations for PyTorch
         if hasattr(torch, 'backends'):
             torch.backends.cudnn.benchmark = True
@@ -55,11 +314,28 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
         if hasattr(torch.nn.functional, 'scaled_dot_product_attention'):
             torch.backends.cuda.enable_flash_sdp(True)
         
+        # Fuse the attention modules into SDPA kernels (before compiling, which wraps the model)
+        if ORTModelForVision2Seq is None or not isinstance(self.model, ORTModelForVision2Seq):
+            try:
+                from optimum.bettertransformer import BetterTransformer
+                
+                print("🔥 Converting model with BetterTransformer...")
+                self.model = BetterTransformer.transform(self.model, keep_original_model=False)
+                print("✅ BetterTransformer conversion completed!")
+            except Exception as e:
+                print(f"⚠️  BetterTransformer conversion skipped: {e}")
+        
         # Compile model for faster inference (PyTorch 2.0+)
         if hasattr(torch, 'compile') and (ORTModelForVision2Seq is None or not isinstance(self.model, ORTModelForVision2Seq)):
             try:
+                # Persist Inductor's compiled graphs so only the first start pays for autotuning
+                # The cache dir is read lazily; the FX graph cache flag was already read from
+                # the environment when torch._inductor.config was imported
+                os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(Globals().cache_dir / "inductor"))
+                torch._inductor.config.fx_graph_cache = True
                 print("🔥 Compiling model with torch.compile for faster inference...")
-                self.model = torch.compile(self.model, mode="reduce-overhead")
+                # Inputs are always padded to FIXED_IMG_SIZE, so static shapes let CUDA graphs be captured
+                self.model = torch.compile(self.model, mode="max-autotune", dynamic=False, fullgraph=False)
                 print("✅ Model compilation completed!")
             except Exception as e:
                 print(f"⚠️  Model compilation failed: {e}")
@@ -71,27 +347,101 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
         else:
             print("🔥 Skipping warmup for ONNX model (not needed)")
         
+    def _attention_kernels(self):
+        """Restrict SDPA to the fused Flash/memory-efficient kernels on CUDA."""
+        if self.device.type != 'cuda' or isinstance(self.model, ORTModelForVision2Seq):
+            return contextlib.nullcontext()
+        from torch.nn.attention import SDPBackend, sdpa_kernel
+        
+        return sdpa_kernel([SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION])
+    
+    def _setup_onnx_runtime(self):
+        """Reload the ONNX model as FP16 on GPU or dynamic INT8 on CPU."""
+        import onnxruntime as ort
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        
+        try:
+            if self.model.device.type == 'cuda':
+                import onnx
+                from onnxconverter_common import float16
+                
+                def to_fp16(src, dst):
+                    # Keep FP32 inputs/outputs so img2latex can feed the model unchanged
+                    onnx.save(float16.convert_float_to_float16(onnx.load(src), keep_io_types=True), dst)
+                
+                print("🔥 Loading FP16 ONNX model (converted on first run)...")
+                provider = "CUDAExecutionProvider"
+                model_dir = _convert_onnx_model(self.model, "fp16", to_fp16, provider)
+                provider_options = {"cudnn_conv_algo_search": "EXHAUSTIVE"}
+            else:
+                print("🔥 Loading INT8 ONNX model (quantized on first run)...")
+                provider = "CPUExecutionProvider"
+                # Not "int8": that cache may hold an all-op quantization the CPU cannot load
+                model_dir = _convert_onnx_model(self.model, "int8-matmul", quantize_int8, provider)
+                provider_options = None
+                session_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+            
+            self.model = ORTModelForVision2Seq.from_pretrained(
+                model_dir,
+                config=self.model.config,
+                provider=provider,
+                provider_options=provider_options,
+                session_options=session_options,
+            )
+            print("✅ Reduced precision ONNX model loaded!")
+        except Exception as e:
+            print(f"⚠️  Reduced precision ONNX setup failed: {e}")
+            print("Continuing with FP32 ONNX model...")
+    
     def _warmup_model(self):
         """Warm up the model with a dummy inference to optimize first run."""
         try:
             print("🔥 Warming up model...")
-            dummy_image = np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
+            # load_model/get_shared_model return the model on CPU; img2latex used to move
+            # it, but generate() is called directly here
+            self.model = self.model.to(self.device)
+            # Build the preprocessed pixel batch directly on the device: warmup only
+            # needs the encoder/decoder shapes, not the image decode and transform path
+            dummy_pixels = torch.empty(
+                (1, IMG_CHANNELS, FIXED_IMG_SIZE, FIXED_IMG_SIZE), device=self.device, dtype=self.model.dtype
+            ).uniform_(0, 1)
+            generation_config = GenerationConfig(
+                max_new_tokens=MAX_TOKEN_SIZE,
+                num_beams=1,
+                do_sample=False,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                bos_token_id=self.tokenizer.bos_token_id,
+            )
             
-            # Run a dummy inference to warm up the model
-            with torch.no_grad():
-                _ = img2latex(
-                    model=self.model,
-                    tokenizer=self.tokenizer,
-                    images=[dummy_image],
-                    device=self.device,
-                    out_format="katex",
-                    keep_style=False,
-                    num_beams=1
-                )
+            # Run a few dummy inferences so autotuning settles on its kernels
+            with torch.no_grad(), self._attention_kernels():
+                for _ in range(WARMUP_ITERATIONS):
+                    _ = self.model.generate(dummy_pixels, generation_config=generation_config)
             print("✅ Model warmup completed!")
         except Exception as e:
             print(f"⚠️  Model warmup failed: {e}")
         
+        if self.device.type == 'cuda':
+            self._capture_encoder_graph()
+    
+    def _capture_encoder_graph(self):
+        """Capture the fixed-shape encoder forward into a replayable CUDA graph."""
+        # Patch the underlying module when the model is wrapped by torch.compile
+        model = getattr(self.model, "_orig_mod", self.model)
+        try:
+            print("🔥 Capturing encoder CUDA graph...")
+            static_input = torch.zeros(
+                (1, IMG_CHANNELS, FIXED_IMG_SIZE, FIXED_IMG_SIZE), device=self.device, dtype=model.dtype
+            )
+            model.encoder = _CUDAGraphEncoder(model.encoder, static_input)
+            print("✅ Encoder CUDA graph captured!")
+        except Exception as e:
+            print(f"⚠️  Encoder CUDA graph capture failed: {e}")
+        
     def on_modified(self, event):
         """Handle file modification events."""
         if event.is_directory:
@@ -101,7 +451,9 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
         # Only process if it's exactly our target file
         if file_path == self.target_file_path:
             # Check if file was actually modified (not just accessed)
-            current_time = os.path.getmtime(file_path)
+            current_time = _statx_mtime(file_path)
+            if current_time is None:
+                return
             if current_time > self.last_modified + 1:  # 1 second debounce
                 self.last_modified = current_time
                 self.process_image(file_path)
@@ -116,17 +468,30 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
             
             start_time = time.time()
             
-            # Use torch.no_grad() for inference to save memory
-            with torch.no_grad():
-                prediction = img2latex(
-                    model=self.model,
-                    tokenizer=self.tokenizer,
-                    images=[image_path],
-                    device=self.device,
-                    out_format="katex",
-                    keep_style=False,
-                    num_beams=1
-                )[0]
+            # Map the file once and feed the same bytes to the hash and, on a cache
+            # miss, to the decoder instead of reading it twice
+            with open(image_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image_data:
+                image_hash = _content_hash(image_data)
+                prediction = self._cache_get(image_hash)
+                image = readimgs([image_data])[0] if prediction is None else None
+            if image is not None and FAST_DOWNSCALE:
+                image = _fast_downscale(image)
+            
+            if prediction is not None:
+                print("⚡ Cache hit, skipping inference")
+            else:
+                # Use torch.no_grad() for inference to save memory
+                with torch.no_grad(), self._attention_kernels():
+                    prediction = img2latex(
+                        model=self.model,
+                        tokenizer=self.tokenizer,
+                        images=[image],
+                        device=self.device,
+                        out_format="katex",
+                        keep_style=False,
+                        num_beams=1
+                    )[0]
+                self._cache_put(image_hash, prediction)
             
             inference_time = time.time() - start_time
             
@@ -146,27 +511,9 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
             self.send_notification("TexTeller", f"Error processing image: {str(e)}", "error")
     
     def send_notification(self, title, message, notification_type="info"):
-        """Send desktop notification using notify-send."""
+        """Send desktop notification over D-Bus (notify-send as fallback)."""
         try:
-            # Map notification types to notify-send urgency levels
-            urgency_map = {
-                "info": "normal",
-                "success": "normal", 
-                "error": "critical",
-                "warning": "normal"
-            }
-            
-            urgency = urgency_map.get(notification_type, "normal")
-            
-            # Send notification using notify-send
-            subprocess.run([
-                'notify-send', 
-                f'--urgency={urgency}',
-                '--app-name=TexTeller',
-                title, 
-                message
-            ], check=True)
-            
+            self._notifier.notify(title, message, notification_type)
         except (subprocess.CalledProcessError, FileNotFoundError):
             print(f"Warning: Could not send notification. Make sure notify-send is installed.")
         except Exception as e:
@@ -177,14 +524,7 @@ class OptimizedLatexPredictorHandler(FileSystemEventHandler):
         try:
             # Try different clipboard methods based on the system
             if sys.platform == "linux":
-                # For Linux, try xclip first, then xsel
-                try:
-                    subprocess.run(['xclip', '-selection', 'clipboard'], input=text, text=True, check=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    try:
-                        subprocess.run(['xsel', '--clipboard', '--input'], input=text, text=True, check=True)
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        print("Warning: Could not copy to clipboard. Install xclip or xsel.")
+                self._clip.copy(text)
             elif sys.platform == "darwin":  # macOS
                 subprocess.run(['pbcopy'], input=text, text=True, check=True)
             elif sys.platform == "win32":  # Windows
@@ -202,7 +542,7 @@ def main():
     # Load model and tokenizer once at startup with optimizations
     try:
         # Use ONNX for better performance with GPU support
-        model = load_model(use_onnx=True)
+        model = get_shared_model(use_onnx=True)
         tokenizer = load_tokenizer()
         device = get_device()
         
@@ -216,18 +556,6 @@ def main():
                 print("Using CUDA execution provider with optimizations")
             else:
                 print("Using CPU execution provider with optimizations")
-        
-        # Send startup notification
-        try:
-            subprocess.run([
-                'notify-send', 
-                '--urgency=normal',
-                '--app-name=TexTeller',
-                'TexTeller Optimized Daemon', 
-                f'Model loaded with optimizations on {device}. Monitoring /tmp/latexPredict.png'
-            ], check=True)
-        except:
-            pass  # Don't fail if notification doesn't work
             
     except Exception as e:
         print(f"Error loading model: {e}")
@@ -236,6 +564,8 @@ def main():
     # Set up file monitoring for the specific file
     target_file = Path("/tmp/latexPredict.png")
     event_handler = OptimizedLatexPredictorHandler(model, tokenizer, device, target_file)
+    # Send startup notification
+    event_handler.send_notification('TexTeller Optimized Daemon', f'Model loaded with optimizations on {device}. Monitoring /tmp/latexPredict.png')
     observer = Observer()
     
     # Monitor the directory containing the target file
@@ -245,15 +575,20 @@ def main():
     print("⚡ Optimized daemon ready - waiting for changes to latexPredict.png...")
     print("Press Ctrl+C to stop.")
     
-    try:
-        observer.start()
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nStopping optimized daemon...")
-        observer.stop()
+    # Sleep until SIGINT/SIGTERM instead of waking up every second
+    stop_event = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop_event.set())
+    # Windows cannot interrupt a blocking wait with Ctrl+C, so poll there
+    timeout = 1 if sys.platform == "win32" else None
     
+    observer.start()
+    while not stop_event.wait(timeout):
+        pass
+    print("\nStopping optimized daemon...")
+    observer.stop()
     observer.join()
+    event_handler.close()
     print("Optimized daemon stopped.")
     return 0
 
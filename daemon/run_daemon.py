@@ -57,6 +57,23 @@ def run_daemon():
     print(f"Using virtual environment: {venv_path}")
     print("=" * 50)
     
+    if not daemon_script.exists():
+        print(f"❌ Daemon script not found: {daemon_script}")
+        return 1
+    
+    if sys.platform == "win32":
+        # os.execv on Windows spawns a new process and returns control to the
+        # shell, so keep the daemon as a child process there
+        return run_in_subprocess(python_path, daemon_script)
+    
+    # Replace this launcher with the daemon so no idle parent interpreter stays
+    # resident; the daemon then owns the terminal and handles Ctrl+C itself
+    sys.stdout.flush()
+    os.execv(str(python_path), [str(python_path), str(daemon_script)])
+
+
+def run_in_subprocess(python_path, daemon_script):
+    """Run the daemon as a child process of this launcher."""
     try:
         # Run the daemon using the virtual environment's Python
         # The virtual environment is automatically activated for this process
@@ -68,9 +85,6 @@ def run_daemon():
         print(f"❌ Error running daemon: {e}")
         print("Virtual environment remains available for future use")
         return 1
-    except FileNotFoundError:
-        print(f"❌ Daemon script not found: {daemon_script}")
-        return 1
     
     print("✅ Daemon stopped")
     print("Virtual environment remains available for future use")
@@ -29,12 +29,31 @@ def create_venv():
         pip_path = venv_path / "bin" / "pip"
         python_path = venv_path / "bin" / "python"
     
+    # Keep downloaded wheels across venv rebuilds so reinstalls skip the network
+    env = os.environ.copy()
+    env["PIP_CACHE_DIR"] = str(Path.home() / ".cache" / "texteller" / "pip")
+    # Prefer prebuilt wheels and resolve from wheel metadata without full downloads.
+    # Build isolation stays on: the editable install needs its build backend.
+    install_flags = ["--prefer-binary", "--use-feature=fast-deps"]
+    
+    # Older pips bundled with venv lack the faster resolver and download paths
+    print("Upgrading pip in virtual environment...")
+    try:
+        subprocess.run([str(python_path), "-m", "pip", "install", "-U", "pip"], check=True, env=env)
+    except subprocess.CalledProcessError as e:
+        print(f"Warning: Could not upgrade pip ({e}), continuing with the bundled version")
+    
     print(f"Installing requirements in virtual environment...")
     
     # Install requirements
     requirements_path = Path(__file__).parent / "daemon_requirements.txt"
+    requirements_cmd = [str(pip_path), "install", *install_flags, "-r", str(requirements_path)]
+    # Use a local wheelhouse of pre-fetched wheels when one is present
+    wheelhouse = project_root / "wheelhouse"
+    if wheelhouse.is_dir():
+        requirements_cmd += ["--find-links", str(wheelhouse)]
     try:
-        subprocess.run([str(pip_path), "install", "-r", str(requirements_path)], check=True)
+        subprocess.run(requirements_cmd, check=True, env=env)
         print("✅ Requirements installed successfully!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error installing requirements: {e}")
@@ -43,7 +62,7 @@ def create_venv():
     # Install the local texteller package in development mode
     print("Installing local texteller package...")
     try:
-        subprocess.run([str(pip_path), "install", "-e", str(project_root)], check=True)
+        subprocess.run([str(pip_path), "install", *install_flags, "-e", str(project_root)], check=True, env=env)
         print("✅ Local texteller package installed successfully!")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error installing local texteller package: {e}")
@@ -6,14 +6,149 @@ Benchmark script to compare standard vs optimized daemon performance.
 import os
 import sys
 import time
-import subprocess
+import contextlib
+from functools import lru_cache
 from pathlib import Path
 import numpy as np
 import cv2
 
 import torch
+import onnxruntime as ort
 from texteller.api import load_model, load_tokenizer, img2latex
 from texteller.utils import get_device
+from texteller.utils.onnx_convert import convert_onnx_model_dir, quantize_int8
+from texteller.globals import Globals
+
+
+# Mathematical expressions rendered into the benchmark images
+EXPRESSIONS = [
+    'E = mc^2',
+    'x^2 + y^2 = r^2',
+    '\\int_0^\\infty e^{-x} dx = 1',
+    '\\sum_{n=1}^{\\infty} \\frac{1}{n^2} = \\frac{\\pi^2}{6}',
+    '\\nabla \\times \\vec{E} = -\\frac{\\partial \\vec{B}}{\\partial t}'
+]
+
+
+@lru_cache(maxsize=None)
+def encode_test_image(index):
+    """Render one expression and PNG-encode it, once per process."""
+    img = np.full((200, 400, 3), 255, dtype=np.uint8)
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    cv2.putText(img, EXPRESSIONS[index], (20, 100), font, 0.7, (0, 0, 0), 2)
+    # Fastest zlib level: the benchmark should measure the model, not libpng
+    _, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    return buf.tobytes()
+
+
+@contextlib.contextmanager
+def timed(label, sink):
+    """Append (label, seconds) for the enclosed block to sink, using the monotonic perf counter."""
+    t0 = time.perf_counter_ns()
+    yield
+    sink.append((label, (time.perf_counter_ns() - t0) / 1e9))
+
+
+def compile_model(model, mode="reduce-overhead"):
+    """
+    Compile a PyTorch model, requiring one full graph for reduce-overhead.
+
+    With graph breaks, reduce-overhead degrades to small compiled regions with eager
+    glue and no CUDA graph, so fullgraph=True makes them fail loudly instead. ONNX
+    Runtime models are not PyTorch modules and are returned unchanged.
+    """
+    if not isinstance(model, torch.nn.Module):
+        print("ℹ️  Skipping compilation: ONNX Runtime models run their own optimized graph")
+        return model
+    
+    # Report why CUDA graphs are skipped (TORCH_LOGS is only read when torch is imported)
+    torch._logging.set_logs(cudagraphs=True)
+    torch._inductor.config.triton.cudagraphs = True
+    try:
+        print(f"🔥 Compiling model ({mode})...")
+        if mode == "reduce-overhead":
+            model = torch.compile(model, mode=mode, fullgraph=True, dynamic=False)
+        else:
+            model = torch.compile(model, mode=mode)
+        print("✅ Model compiled!")
+    except Exception as e:
+        print(f"⚠️  Compilation failed: {e}")
+    return model
+
+
+def init_cuda_context():
+    """Create the CUDA context up front, so lazy initialization is not charged to model load."""
+    if torch.cuda.is_available():
+        torch.cuda.init()
+        _ = torch.empty(1, device="cuda") + 1
+        torch.cuda.synchronize()
+
+
+def build_ort_session_options(pre_optimized=False):
+    """
+    Build ONNX Runtime session options tuned for single-process inference.
+
+    Graphs from get_optimized_model_dir are already optimized, so pre_optimized=True
+    turns graph optimization off instead of redoing it at every session creation.
+    """
+    so = ort.SessionOptions()
+    if pre_optimized:
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    else:
+        # Constant folding, op fusion and layout optimizations
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # One intra-op thread per physical core (assuming SMT), no inter-op pool
+    so.intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+    so.inter_op_num_threads = 1
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.enable_mem_pattern = True
+    so.enable_cpu_mem_arena = True
+    return so
+
+
+def get_onnx_model_dir():
+    """Get the directory of the default ONNX model files."""
+    return Path(load_model(use_onnx=True).model_save_dir)
+
+
+def get_int8_model_dir():
+    """
+    Get a dynamically quantized INT8 copy of the ONNX model, quantizing on first use.
+
+    MatMul/Gemm weights are stored as uint8, halving the weight bandwidth the
+    memory-bound decoder steps pay. The result is cached under the TexTeller cache
+    directory, so later benchmark runs skip quantization.
+    """
+    int8_dir = Globals().cache_dir / "onnx" / "benchmark-int8"
+    if int8_dir.exists():
+        return int8_dir
+    
+    print("🔥 Quantizing ONNX model to INT8 (first run only)...")
+    return convert_onnx_model_dir(get_onnx_model_dir(), int8_dir, quantize_int8)
+
+
+def get_optimized_model_dir(variant, get_src_dir):
+    """
+    Get ONNX Runtime's optimized graphs of a model, saving them on first use.
+
+    Every ONNX file gets its own optimized_model_filepath, since the encoder and
+    decoder sessions of one model cannot share an output file. The saved graphs may
+    contain hardware-specific layout optimizations, so the cache is per machine.
+    """
+    opt_dir = Globals().cache_dir / "onnx" / f"{variant}-ort-optimized"
+    if opt_dir.exists():
+        return opt_dir
+    
+    # Optimize for the provider the model will run on: fusions differ between them
+    provider = "CUDAExecutionProvider" if torch.cuda.is_available() else "CPUExecutionProvider"
+    
+    def optimize(src, dst):
+        so = build_ort_session_options()
+        so.optimized_model_filepath = str(dst)
+        ort.InferenceSession(str(src), so, providers=[provider])
+    
+    print(f"🔥 Saving optimized ONNX graphs for {variant} (first run only)...")
+    return convert_onnx_model_dir(get_src_dir(), opt_dir, optimize, provider)
 
 
 def create_test_images(num_images=5):
@@ -21,161 +156,143 @@ def create_test_images(num_images=5):
     test_images = []
     
     for i in range(num_images):
-        # Create a test image with mathematical content
-        img = np.ones((200, 400, 3), dtype=np.uint8) * 255
-        
-        # Add different mathematical expressions
-        expressions = [
-            'E = mc^2',
-            'x^2 + y^2 = r^2',
-            '\\int_0^\\infty e^{-x} dx = 1',
-            '\\sum_{n=1}^{\\infty} \\frac{1}{n^2} = \\frac{\\pi^2}{6}',
-            '\\nabla \\times \\vec{E} = -\\frac{\\partial \\vec{B}}{\\partial t}'
-        ]
-        
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        cv2.putText(img, expressions[i], (20, 100), font, 0.7, (0, 0, 0), 2)
-        
         # Save image
         img_path = Path(f"/tmp/test_image_{i}.png")
-        cv2.imwrite(str(img_path), img)
+        img_path.write_bytes(encode_test_image(i))
         test_images.append(str(img_path))
     
     return test_images
 
 
-def benchmark_standard_model():
-    """Benchmark the standard model."""
-    print("🔍 Benchmarking Standard Model...")
-    print("-" * 40)
+def remove_test_images(test_images):
+    """Remove the benchmark images once both benchmarks have used them."""
+    for img_path in test_images:
+        # Tolerate images already cleaned up (e.g. by a concurrent run sharing /tmp)
+        Path(img_path).unlink(missing_ok=True)
+
+
+def _apply_torch_flags():
+    """Enable cuDNN autotuning once, for both benchmarks."""
+    if hasattr(torch, 'backends'):
+        torch.backends.cudnn.benchmark = True
+        torch.backends.cudnn.deterministic = False
+
+
+def load_once():
+    """Create the CUDA context and load the tokenizer once for both benchmarks."""
+    timings = []
     
-    # Load standard model
-    start_time = time.time()
-    model = load_model(use_onnx=True)
+    # CUDA context creation is reported separately from the model load
+    with timed("cuda_init", timings):
+        init_cuda_context()
     tokenizer = load_tokenizer()
     device = get_device()
-    load_time = time.time() - start_time
     
-    print(f"Model load time: {load_time:.2f}s")
+    cuda_init_time = dict(timings)["cuda_init"]
+    print(f"CUDA init time: {cuda_init_time:.2f}s")
     print(f"Device: {device}")
+    return tokenizer, device, cuda_init_time
+
+
+def predict(model, tokenizer, device, test_images):
+    """Predict all test images as one batch."""
+    return img2latex(
+        model=model,
+        tokenizer=tokenizer,
+        images=test_images,
+        device=device,
+        out_format="katex",
+        keep_style=False,
+        num_beams=1
+    )
+
+
+def time_inference(model, tokenizer, device, test_images):
+    """Time one batched prediction of the test images and return the average per image."""
+    timings = []
     
-    # Create test images
-    test_images = create_test_images(3)
+    # Benchmark inference on all images as one batch, under the grad mode the
+    # optimized model is compiled in
+    with torch.inference_mode(), timed("batch", timings):
+        predictions = predict(model, tokenizer, device, test_images)
+    total_time = dict(timings)["batch"]
     
-    # Benchmark inference
-    inference_times = []
-    for i, img_path in enumerate(test_images):
-        start_time = time.time()
-        
-        with torch.no_grad():
-            prediction = img2latex(
-                model=model,
-                tokenizer=tokenizer,
-                images=[img_path],
-                device=device,
-                out_format="katex",
-                keep_style=False,
-                num_beams=1
-            )[0]
-        
-        inference_time = time.time() - start_time
-        inference_times.append(inference_time)
-        
-        print(f"Image {i+1} inference time: {inference_time:.2f}s")
-        print(f"Prediction: {prediction[:50]}...")
+    for i, prediction in enumerate(predictions):
+        print(f"Image {i+1} prediction: {prediction[:50]}...")
     
-    avg_inference_time = sum(inference_times) / len(inference_times)
+    avg_inference_time = total_time / len(test_images)
+    print(f"Batch inference time: {total_time:.2f}s for {len(test_images)} images")
     print(f"Average inference time: {avg_inference_time:.2f}s")
+    return avg_inference_time
+
+
+def apply_optimizations(model, tokenizer, device, test_images):
+    """Compile the model and warm it up on the test batch, on CUDA only."""
+    # Without CUDA graphs, reduce-overhead only adds Inductor compile time and guard
+    # checks to short calls. The CPU model already runs the INT8 graph ONNX Runtime
+    # optimized with ORT_ENABLE_ALL, so there is nothing left to apply here.
+    if device.type != 'cuda' or not hasattr(torch, 'compile'):
+        print("ℹ️  Skipping compilation and warmup: no CUDA device")
+        return model
     
-    # Cleanup
-    for img_path in test_images:
-        os.remove(img_path)
-    
-    return load_time, avg_inference_time
+    # Compile and warm up under inference_mode, the grad mode the timed run uses
+    with torch.inference_mode():
+        model = compile_model(model)
+        
+        # Warm up twice on the benchmark batch itself: the first run compiles, the
+        # second records the CUDA graphs, so the timed run only replays them. The
+        # batch size is part of the captured shape, and a blank image would trim
+        # down to nothing in preprocessing.
+        print("🔥 Warming up model...")
+        for _ in range(2):
+            try:
+                _ = predict(model, tokenizer, device, test_images)
+            except torch._dynamo.exc.Unsupported as e:
+                # fullgraph=True turns graph breaks into errors on the first call
+                print(f"⚠️  Model does not compile to one graph, falling back to default mode: {e}")
+                model = compile_model(model._orig_mod, mode="default")
+                _ = predict(model, tokenizer, device, test_images)
+        print("✅ Warmup completed!")
+    return model
 
 
-def benchmark_optimized_model():
-    """Benchmark the optimized model."""
-    print("\n⚡ Benchmarking Optimized Model...")
+def benchmark_standard_model(tokenizer, device, test_images):
+    """Benchmark the standard model."""
+    print("\n🔍 Benchmarking Standard Model...")
     print("-" * 40)
     
-    # Load optimized model
-    start_time = time.time()
-    model = load_model(use_onnx=True)
-    tokenizer = load_tokenizer()
-    device = get_device()
-    
-    # Apply optimizations
-    import torch
-    if hasattr(torch, 'backends'):
-        torch.backends.cudnn.benchmark = True
-        torch.backends.cudnn.deterministic = False
-    
-    if device.type == 'cpu':
-        torch.set_num_threads(min(4, os.cpu_count() or 1))
-    
-    # Compile model if possible
-    if hasattr(torch, 'compile') and not isinstance(model, type):
-        try:
-            print("🔥 Compiling model...")
-            model = torch.compile(model, mode="reduce-overhead")
-            print("✅ Model compiled!")
-        except Exception as e:
-            print(f"⚠️  Compilation failed: {e}")
-    
-    load_time = time.time() - start_time
+    # Saving the optimized graphs is a one-off artifact build, not part of the load time
+    model_dir = get_optimized_model_dir("fp32", get_onnx_model_dir)
     
+    # Load standard model
+    timings = []
+    with timed("load", timings):
+        model = load_model(model_dir=str(model_dir), use_onnx=True, session_options=build_ort_session_options(pre_optimized=True))
+    load_time = dict(timings)["load"]
     print(f"Model load time: {load_time:.2f}s")
-    print(f"Device: {device}")
     
-    # Warm up
-    print("🔥 Warming up model...")
-    dummy_image = np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
-    with torch.no_grad():
-        _ = img2latex(
-            model=model,
-            tokenizer=tokenizer,
-            images=[dummy_image],
-            device=device,
-            out_format="katex",
-            keep_style=False,
-            num_beams=1
-        )
-    print("✅ Warmup completed!")
-    
-    # Create test images
-    test_images = create_test_images(3)
-    
-    # Benchmark inference
-    inference_times = []
-    for i, img_path in enumerate(test_images):
-        start_time = time.time()
-        
-        with torch.no_grad():
-            prediction = img2latex(
-                model=model,
-                tokenizer=tokenizer,
-                images=[img_path],
-                device=device,
-                out_format="katex",
-                keep_style=False,
-                num_beams=1
-            )[0]
-        
-        inference_time = time.time() - start_time
-        inference_times.append(inference_time)
-        
-        print(f"Image {i+1} inference time: {inference_time:.2f}s")
-        print(f"Prediction: {prediction[:50]}...")
+    return load_time, time_inference(model, tokenizer, device, test_images)
+
+
+def benchmark_optimized_model(tokenizer, device, test_images):
+    """Benchmark the optimized model."""
+    print("\n⚡ Benchmarking Optimized Model...")
+    print("-" * 40)
     
-    avg_inference_time = sum(inference_times) / len(inference_times)
-    print(f"Average inference time: {avg_inference_time:.2f}s")
+    # Quantization and graph optimization are one-off artifact builds, not part of the
+    # load time. The INT8 weights are a different artifact, so this model gets its own
+    # session instead of reusing the standard one.
+    model_dir = get_optimized_model_dir("benchmark-int8", get_int8_model_dir)
     
-    # Cleanup
-    for img_path in test_images:
-        os.remove(img_path)
+    # Load optimized model
+    timings = []
+    with timed("load", timings):
+        model = load_model(model_dir=str(model_dir), use_onnx=True, session_options=build_ort_session_options(pre_optimized=True))
+    load_time = dict(timings)["load"]
+    print(f"Model load time: {load_time:.2f}s")
     
-    return load_time, avg_inference_time
+    model = apply_optimizations(model, tokenizer, device, test_images)
+    return load_time, time_inference(model, tokenizer, device, test_images)
 
 
 def main():
@@ -183,17 +300,25 @@ def main():
     print("🚀 TexTeller Performance Benchmark")
     print("=" * 50)
     
+    test_images = []
     try:
+        # Shared by both benchmarks, so they run from the same state
+        _apply_torch_flags()
+        tokenizer, device, cuda_init_time = load_once()
+        test_images = create_test_images(3)
+        
         # Benchmark standard model
-        std_load_time, std_inference_time = benchmark_standard_model()
+        std_load_time, std_inference_time = benchmark_standard_model(tokenizer, device, test_images)
         
         # Benchmark optimized model
-        opt_load_time, opt_inference_time = benchmark_optimized_model()
+        opt_load_time, opt_inference_time = benchmark_optimized_model(tokenizer, device, test_images)
         
         # Compare results
         print("\n📊 Performance Comparison")
         print("=" * 50)
-        print(f"Load Time:")
+        print(f"CUDA Init Time: {cuda_init_time:.2f}s (once, not counted below)")
+        
+        print(f"\nLoad Time:")
         print(f"  Standard:  {std_load_time:.2f}s")
         print(f"  Optimized: {opt_load_time:.2f}s")
         print(f"  Speedup:   {std_load_time/opt_load_time:.2f}x")
@@ -213,6 +338,8 @@ def main():
     except Exception as e:
         print(f"❌ Benchmark failed: {e}")
         return 1
+    finally:
+        remove_test_images(test_images)
     
     return 0
 
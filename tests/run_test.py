@@ -11,35 +11,25 @@ import subprocess
 from pathlib import Path
 
 
-def get_venv_paths():
-    """Get the virtual environment paths based on the operating system."""
+def get_venv_python() -> Path:
+    """Get the virtual environment's Python executable for the operating system."""
     project_root = Path(__file__).parent.parent  # Go up one level from tests/
     venv_path = project_root / "daemon_venv"
     
     if sys.platform == "win32":
-        python_path = venv_path / "Scripts" / "python.exe"
-    else:
-        python_path = venv_path / "bin" / "python"
-    
-    return venv_path, python_path
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
 
 
 def check_venv_exists():
     """Check if the virtual environment exists."""
-    venv_path, python_path = get_venv_paths()
-    
-    if not venv_path.exists():
+    # A usable interpreter implies the venv itself exists, so one check covers both
+    if not get_venv_python().is_file():
         print("❌ Virtual environment not found!")
         print("Please run the setup script first:")
         print("  python daemon/venv_setup.py")
         return False
     
-    if not python_path.exists():
-        print("❌ Python executable not found in virtual environment!")
-        print("Please recreate the virtual environment:")
-        print("  python daemon/venv_setup.py")
-        return False
-    
     return True
 
 
@@ -48,13 +38,30 @@ def run_test():
     if not check_venv_exists():
         return 1
     
-    venv_path, python_path = get_venv_paths()
+    python_path = get_venv_python()
     test_script = Path(__file__).parent / "test_daemon.py"
     
     print("🧪 Running TexTeller Daemon Test...")
-    print(f"Using virtual environment: {venv_path}")
+    print(f"Using virtual environment: {python_path.parent.parent}")
     print("=" * 50)
     
+    if not test_script.is_file():
+        print(f"❌ Test script not found: {test_script}")
+        return 1
+    
+    if sys.platform == "win32":
+        # os.execv on Windows spawns a new process and returns control to the
+        # shell, so keep the test as a child process there
+        return run_in_subprocess(python_path, test_script)
+    
+    # Replace this launcher with the test so no second interpreter stays alive;
+    # the test's own exit code becomes the launcher's
+    sys.stdout.flush()
+    os.execv(str(python_path), [str(python_path), str(test_script)])
+
+
+def run_in_subprocess(python_path, test_script):
+    """Run the test as a child process of this launcher."""
     try:
         # Run the test using the virtual environment's Python
         # The virtual environment is automatically activated for this process
@@ -63,9 +70,6 @@ def run_test():
         print(f"❌ Error running test: {e}")
         print("Virtual environment remains available for future use")
         return 1
-    except FileNotFoundError:
-        print(f"❌ Test script not found: {test_script}")
-        return 1
     
     print("✅ Test completed")
     print("Virtual environment remains available for future use")
@@ -7,21 +7,25 @@ This script creates a test image and saves it to the monitored location.
 import os
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 import numpy as np
 import cv2
 
+@lru_cache(maxsize=None)
 def create_test_image():
-    """Create a simple test image with mathematical content."""
+    """Create a simple test image with mathematical content, as PNG bytes."""
     # Create a white background
-    img = np.ones((200, 400, 3), dtype=np.uint8) * 255
+    img = np.full((200, 400, 3), 255, dtype=np.uint8)
     
     # Add some text to simulate a mathematical equation
     font = cv2.FONT_HERSHEY_SIMPLEX
     cv2.putText(img, 'E = mc^2', (50, 100), font, 1, (0, 0, 0), 2)
     cv2.putText(img, 'x^2 + y^2 = r^2', (50, 150), font, 0.7, (0, 0, 0), 2)
     
-    return img
+    # Encode once with the fastest zlib level
+    _, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    return buf.tobytes()
 
 def main():
     """Test the daemon by creating a test image."""
@@ -34,8 +38,7 @@ def main():
     print(f"Creating test image at: {test_image_path}")
     
     # Create and save test image
-    test_img = create_test_image()
-    cv2.imwrite(str(test_image_path), test_img)
+    test_image_path.write_bytes(create_test_image())
     
     print("Test image created successfully!")
     print("If the daemon is running, it should detect this change and process the image.")
@@ -1,5 +1,9 @@
+import dataclasses
 import logging
-from texteller.globals import Globals
+
+import pytest
+
+from texteller.globals import CONFIG, Config, Globals
 
 
 def test_singleton_pattern():
@@ -65,3 +69,46 @@ def test_representation():
     assert repr_string.startswith("<Globals:")
     assert "repo_name" in repr_string
     assert "logging_level" in repr_string
+
+
+def test_predefined_attributes_in_slots():
+    """Test that predefined variables are slots and stay out of the dynamic dict."""
+    globals_instance = Globals()
+    assert "cache_dir" in Globals.__slots__
+    assert "cache_dir" not in globals_instance.__dict__
+    assert "cache_dir" in repr(globals_instance)
+
+
+def test_default_cache_dir():
+    """Test the default cache directory is absolute and expanded."""
+    cache_dir = Globals().cache_dir
+    assert cache_dir.is_absolute()
+    assert "~" not in str(cache_dir)
+    assert cache_dir.name == "texteller"
+
+
+def test_enable_http_parsing(monkeypatch):
+    """Test that TEXTELLER_ENABLE_HTTP accepts the usual truthy spellings."""
+    from texteller.globals import _build_globals
+
+    for value in ("1", "true", " Yes ", "ON", "y", "t"):
+        monkeypatch.setenv("TEXTELLER_ENABLE_HTTP", value)
+        assert _build_globals().enable_http is True
+
+    for value in ("", "0", "false", "off", "nope"):
+        monkeypatch.setenv("TEXTELLER_ENABLE_HTTP", value)
+        assert _build_globals().enable_http is False
+
+    monkeypatch.delenv("TEXTELLER_ENABLE_HTTP")
+    assert _build_globals().enable_http is False
+
+
+def test_config_is_frozen():
+    """Test that CONFIG mirrors the Globals defaults and cannot be modified."""
+    assert CONFIG.repo_name == "OleehyO/TexTeller"
+    assert CONFIG.logging_level == logging.INFO
+    assert CONFIG.cache_dir == Globals().cache_dir
+    assert not hasattr(CONFIG, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        CONFIG.enable_http = True
+    assert Config(enable_http=True).enable_http is True
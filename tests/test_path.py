@@ -0,0 +1,33 @@
+import pytest
+from texteller.utils.path import atomic_dir
+
+
+def test_atomic_dir_renames_into_place(tmp_path):
+    """Test that the directory only appears under its name once it is complete."""
+    target = tmp_path / "model"
+    with atomic_dir(target) as tmp_dir:
+        (tmp_dir / "weights.pt").write_bytes(b"weights")
+        assert not target.exists()
+    assert (target / "weights.pt").read_bytes() == b"weights"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_atomic_dir_discards_interrupted_build(tmp_path):
+    """Test that a failed build leaves neither the target nor the scratch directory."""
+    target = tmp_path / "model"
+    with pytest.raises(RuntimeError):
+        with atomic_dir(target) as tmp_dir:
+            (tmp_dir / "weights.pt").write_bytes(b"partial")
+            raise RuntimeError("interrupted")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_atomic_dir_keeps_concurrent_copy(tmp_path):
+    """Test that a copy renamed into place by another process first is kept."""
+    target = tmp_path / "model"
+    with atomic_dir(target) as tmp_dir:
+        (tmp_dir / "weights.pt").write_bytes(b"ours")
+        target.mkdir()
+        (target / "weights.pt").write_bytes(b"theirs")
+    assert (target / "weights.pt").read_bytes() == b"theirs"
+    assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,25 @@
+import cv2
+import numpy as np
+import pytest
+from texteller.utils import readimgs
+
+
+def test_readimgs_from_encoded_bytes(tmp_path):
+    """Test that encoded image contents decode the same as the file they came from."""
+    # Pure blue in OpenCV's BGR order
+    img = np.zeros((20, 40, 3), dtype=np.uint8)
+    img[:, :, 0] = 255
+    img_path = tmp_path / "img.png"
+    cv2.imwrite(str(img_path), img)
+
+    from_path, from_bytes = readimgs([str(img_path), img_path.read_bytes()])
+
+    assert np.array_equal(from_path, from_bytes)
+    # Returned images are RGB
+    assert from_bytes[0, 0].tolist() == [0, 0, 255]
+
+
+def test_readimgs_invalid_bytes():
+    """Test that undecodable contents raise like unreadable paths."""
+    with pytest.raises(ValueError):
+        readimgs([b"not an image"])
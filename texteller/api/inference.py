@@ -36,7 +36,7 @@ _logger = get_logger()
 def img2latex(
     model: TexTellerModel,
     tokenizer: RobertaTokenizerFast,
-    images: list[str] | list[np.ndarray],
+    images: list[str] | list[bytes] | list[np.ndarray],
     device: torch.device | None = None,
     out_format: Literal["latex", "katex"] = "latex",
     keep_style: bool = False,
@@ -50,7 +50,7 @@ def img2latex(
     Args:
         model: The TexTeller or ORTModelForVision2Seq model instance
         tokenizer: The tokenizer for the model
-        images: List of image paths or numpy arrays (RGB format)
+        images: List of image paths, encoded image contents (e.g. PNG bytes) or numpy arrays (RGB format)
         device: The torch device to use (defaults to available GPU or CPU)
         out_format: Output format, either "latex" or "katex"
         keep_style: Whether to keep the style of the LaTeX
@@ -85,11 +85,11 @@ def img2latex(
         else:
             model = model.to(device=device)
 
-    if isinstance(images[0], str):
-        images = readimgs(images)
-    else:  # already numpy array(rgb format)
-        assert isinstance(images[0], np.ndarray)
+    if isinstance(images[0], np.ndarray):  # already numpy array(rgb format)
         images = images
+    else:  # image paths or encoded image contents
+        assert isinstance(images[0], (str, bytes, bytearray, memoryview))
+        images = readimgs(images)
 
     images = transform(images)
     pixel_values = torch.stack(images)
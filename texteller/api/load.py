@@ -1,7 +1,7 @@
 from pathlib import Path
 
 import wget
-from onnxruntime import InferenceSession
+from onnxruntime import InferenceSession, SessionOptions
 from transformers import RobertaTokenizerFast
 
 from texteller.constants import LATEX_DET_MODEL_URL, TEXT_DET_MODEL_URL, TEXT_REC_MODEL_URL
@@ -16,7 +16,11 @@ from texteller.types import TexTellerModel
 _logger = get_logger(__name__)
 
 
-def load_model(model_dir: str | None = None, use_onnx: bool = False) -> TexTellerModel:
+def load_model(
+    model_dir: str | None = None,
+    use_onnx: bool = False,
+    session_options: SessionOptions | None = None,
+) -> TexTellerModel:
     """
     Load the TexTeller model for LaTeX recognition.
 
@@ -28,6 +32,8 @@ def load_model(model_dir: str | None = None, use_onnx: bool = False) -> TexTelle
         model_dir: Directory containing the model files. If None, uses the default model.
         use_onnx: Whether to load the ONNX version of the model for faster inference.
                   Requires the 'optimum' package and ONNX Runtime.
+        session_options: ONNX Runtime session options (threading, graph optimization level)
+                         for the ONNX model. Ignored for the PyTorch model.
 
     Returns:
         Loaded TexTeller model instance
@@ -37,7 +43,7 @@ def load_model(model_dir: str | None = None, use_onnx: bool = False) -> TexTelle
         >>>
         >>> model = load_model(use_onnx=True)
     """
-    return TexTeller.from_pretrained(model_dir, use_onnx=use_onnx)
+    return TexTeller.from_pretrained(model_dir, use_onnx=use_onnx, session_options=session_options)
 
 
 def load_tokenizer(tokenizer_dir: str | None = None) -> RobertaTokenizerFast:
@@ -8,7 +8,7 @@ import time
 import click
 from ray import serve
 
-from texteller.globals import Globals
+from texteller.globals import CONFIG, Globals
 from texteller.utils import get_device
 
 
@@ -98,7 +98,7 @@ def launch(
     from texteller.cli.commands.launch.server import Ingress, TexTellerServer
 
     if enable_http is None:
-        enable_http = Globals().enable_http
+        enable_http = CONFIG.enable_http
     if not enable_http:
         click.echo(
             click.style(
@@ -1,8 +1,7 @@
-import os
 import sys
 import click
 from pathlib import Path
-from texteller.globals import Globals
+from texteller.globals import CONFIG
 
 
 @click.command()
@@ -14,7 +13,7 @@ from texteller.globals import Globals
 def web(enable_http: bool | None = None):
     """Launch the web interface for TexTeller."""
     if enable_http is None:
-        enable_http = Globals().enable_http
+        enable_http = CONFIG.enable_http
     if not enable_http:
         click.echo(
             click.style(
@@ -24,4 +23,10 @@ def web(enable_http: bool | None = None):
         )
         sys.exit(1)
 
-    os.system(f"streamlit run {Path(__file__).parent / 'streamlit_demo.py'}")
+    # Run Streamlit in this interpreter, as the `streamlit run` entry point does,
+    # instead of paying for a shell and a second Python + torch start-up
+    from streamlit.web import bootstrap
+
+    script = str(Path(__file__).parent / "streamlit_demo.py")
+    bootstrap.load_config_options(flag_options={})
+    bootstrap.run(script, is_hello=False, args=[], flag_options={})
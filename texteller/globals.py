@@ -1,7 +1,11 @@
+import functools
 import logging
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
 
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
+
 
 class Globals:
     """
@@ -23,28 +27,54 @@ class Globals:
         >>> print(Globals())  # Output: <Globals: {'repo_name': ..., 'new_var': ...}>
     """
 
+    # Predefined variables live in slots; "__dict__" keeps dynamic attributes working
+    __slots__ = ("repo_name", "logging_level", "cache_dir", "enable_http", "__dict__")
     _instance = None
-    _initialized = False
 
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        if not self._initialized:
-            self.repo_name = "OleehyO/TexTeller"
-            self.logging_level = logging.INFO
-            self.cache_dir = Path("~/.cache/texteller").expanduser().resolve()
-            # Control whether HTTP/webserver functionality is allowed
-            env_enable_http = os.getenv("TEXTELLER_ENABLE_HTTP")
-            if env_enable_http is None:
-                # Default: disable HTTP/webserver functionality unless explicitly enabled
-                self.enable_http = False
-            else:
-                val = env_enable_http.strip().lower()
-                self.enable_http = val in ("1", "true", "yes", "on")
-            self.__class__._initialized = True
-
     def __repr__(self):
-        return f"<Globals: {self.__dict__}>"
+        variables = {name: getattr(self, name) for name in self.__slots__ if name != "__dict__"}
+        variables.update(self.__dict__)
+        return f"<Globals: {variables}>"
+
+
+@functools.cache
+def _default_cache_dir() -> Path:
+    """Default cache directory; abspath needs no per-component stat calls like resolve()."""
+    return Path(os.path.abspath(os.path.expanduser("~/.cache/texteller")))
+
+
+def _parse_enable_http() -> bool:
+    """Control whether HTTP/webserver functionality is allowed (disabled unless explicitly enabled)."""
+    val = os.getenv("TEXTELLER_ENABLE_HTTP")
+    return bool(val) and val.strip().lower() in _TRUTHY
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Read-only settings fixed at start-up; use Globals for values changed at runtime."""
+
+    repo_name: str = "OleehyO/TexTeller"
+    logging_level: int = logging.INFO
+    cache_dir: Path = field(default_factory=_default_cache_dir)
+    enable_http: bool = field(default_factory=_parse_enable_http)
+
+
+CONFIG = Config()
+
+
+def _build_globals() -> Globals:
+    """Build the singleton once, at import time, so Globals() is a plain lookup."""
+    # Predefined variables start from a fresh Config, so both read the same environment
+    config = Config()
+    instance = object.__new__(Globals)
+    instance.repo_name = config.repo_name
+    instance.logging_level = config.logging_level
+    instance.cache_dir = config.cache_dir
+    instance.enable_http = config.enable_http
+    return instance
+
+
+Globals._instance = _build_globals()
@@ -24,21 +24,22 @@ class TexTeller(VisionEncoderDecoderModel):
         super().__init__(config=config)
 
     @classmethod
-    def from_pretrained(cls, model_dir: str | None = None, use_onnx=False) -> TexTellerModel:
+    def from_pretrained(
+        cls, model_dir: str | None = None, use_onnx=False, session_options=None
+    ) -> TexTellerModel:
         if model_dir is None or model_dir == Globals().repo_name:
-            if not use_onnx:
-                return VisionEncoderDecoderModel.from_pretrained(Globals().repo_name)
-            else:
-                from optimum.onnxruntime import ORTModelForVision2Seq
-
-                return ORTModelForVision2Seq.from_pretrained(
-                    Globals().repo_name,
-                    provider="CUDAExecutionProvider"
-                    if cuda_available()
-                    else "CPUExecutionProvider",
-                )
-        model_dir = Path(model_dir).resolve()
-        return VisionEncoderDecoderModel.from_pretrained(str(model_dir))
+            model_dir = Globals().repo_name
+        else:
+            model_dir = str(Path(model_dir).resolve())
+        if not use_onnx:
+            return VisionEncoderDecoderModel.from_pretrained(model_dir)
+        from optimum.onnxruntime import ORTModelForVision2Seq
+
+        return ORTModelForVision2Seq.from_pretrained(
+            model_dir,
+            provider="CUDAExecutionProvider" if cuda_available() else "CPUExecutionProvider",
+            session_options=session_options,
+        )
 
     @classmethod
     def get_tokenizer(cls, tokenizer_dir: str = None) -> RobertaTokenizerFast:
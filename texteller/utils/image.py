@@ -19,17 +19,18 @@ from texteller.logger import get_logger
 _logger = get_logger()
 
 
-def readimgs(image_paths: list[str]) -> list[np.ndarray]:
+def readimgs(image_paths: list[str] | list[bytes]) -> list[np.ndarray]:
     """
-    Read and preprocess a list of images from their file paths.
+    Read and preprocess a list of images from their file paths or encoded contents.
 
-    This function reads each image from the provided paths, handles different
-    bit depths (converting 16-bit to 8-bit if necessary), and normalizes color
-    channels to RGB format regardless of the original color space (BGR, BGRA,
-    or grayscale).
+    This function reads each image from the provided paths (or decodes it from
+    an in-memory encoded image such as PNG bytes), handles different bit depths
+    (converting 16-bit to 8-bit if necessary), and normalizes color channels to
+    RGB format regardless of the original color space (BGR, BGRA, or grayscale).
 
     Args:
-        image_paths (list[str]): A list of file paths to the images to be read.
+        image_paths (list[str] | list[bytes]): A list of file paths to the images to be
+            read, or of encoded image contents as bytes-like objects.
 
     Returns:
         list[np.ndarray]: A list of NumPy arrays containing the preprocessed images
@@ -37,7 +38,11 @@ def readimgs(image_paths: list[str]) -> list[np.ndarray]:
     """
     processed_images = []
     for path in image_paths:
-        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if isinstance(path, str):
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        else:
+            image = cv2.imdecode(np.frombuffer(path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            path = "<buffer>"
         if image is None:
             raise ValueError(f"Image at {path} could not be read.")
         if image.dtype == np.uint16:
@@ -0,0 +1,54 @@
+import shutil
+from pathlib import Path
+from typing import Callable
+
+from .path import atomic_dir
+
+
+def convert_onnx_model_dir(
+    src_dir: str | Path,
+    dst_dir: str | Path,
+    convert: Callable[[str, str], None],
+    provider: str = "CPUExecutionProvider",
+) -> Path:
+    """Apply `convert(src_path, dst_path)` to every ONNX file in src_dir, into dst_dir atomically.
+
+    Every converted file is loaded into an ONNX Runtime session on `provider` before
+    dst_dir is renamed into place, so a conversion the provider cannot run is never
+    cached. The JSON configs next to the ONNX files are copied unchanged.
+
+    Args:
+        src_dir: Directory of the source ONNX model
+        dst_dir: Directory to write the converted model to
+        convert: Writes the converted version of the ONNX file at its first argument
+            to its second argument
+        provider: ONNX Runtime execution provider the converted model will run on
+
+    Returns:
+        dst_dir
+    """
+    import onnxruntime as ort
+
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    with atomic_dir(dst_dir) as tmp_dir:
+        for src in src_dir.rglob("*.onnx"):
+            dst = tmp_dir / src.relative_to(src_dir)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            convert(str(src), str(dst))
+            ort.InferenceSession(str(dst), providers=[provider])
+        for src in src_dir.glob("*.json"):
+            shutil.copy(src, tmp_dir / src.name)
+    return dst_dir
+
+
+def quantize_int8(src: str, dst: str) -> None:
+    """Dynamically quantize the MatMul/Gemm weights of an ONNX model to uint8.
+
+    Other op types are left in FP32: quantizing the ViT patch embedding's Conv would
+    produce a ConvInteger, which ONNX Runtime's CPU provider has no kernel for.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        src, dst, weight_type=QuantType.QUInt8, op_types_to_quantize=["MatMul", "Gemm"]
+    )
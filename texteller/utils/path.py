@@ -1,5 +1,8 @@
+import os
+import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Literal
+from typing import Iterator, Literal
 
 from texteller.logger import get_logger
 
@@ -50,3 +53,31 @@ def rmdir(path: str | Path, mode: Literal["empty", "recursive"] = "empty") -> No
         _logger.info(f"Recursively removed directory and all contents: {path}")
     else:
         raise ValueError(f"Invalid mode: {mode}. Must be 'empty' or 'all'")
+
+
+@contextmanager
+def atomic_dir(path: str | Path) -> Iterator[Path]:
+    """Build a directory under a scratch name and rename it into place once complete.
+
+    An interrupted build leaves only the scratch directory behind, so `path` never
+    holds partial contents. If another process renames its copy into place first,
+    that copy is kept and this one is discarded.
+
+    Yields:
+        The scratch directory to fill in.
+    """
+    if isinstance(path, str):
+        path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    try:
+        yield tmp_path
+        tmp_path.rename(path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not path.is_dir():
+            raise
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise